@@ -661,64 +661,76 @@ class InferenceEngine:
             f"Guardrail contract missing for category '{category_key}' in language '{lang}' and fallback 'en'."
         )
 
-    def _resolve_jailbreak_override_response(self, prompt: str, severity: str) -> str:
+    def _override_response_cache(self) -> dict:
+        # Lazy so stub engines built via object.__new__ in tests still work.
+        return self.__dict__.setdefault("_guardrail_override_responses", {})
+
+    def _resolve_category_override_response(
+        self,
+        prompt: str,
+        severity: str,
+        *,
+        category: str,
+        subtype: str,
+    ) -> str:
         language = detect_language(prompt)
-        tone_profile = calibrate_tone("A", severity, "JAILBREAK_ATTEMPT")
-        variants = self._load_contract_guardrail_variants(language, "jailbreak", skeleton="A")
+        # Resolution is deterministic per (subtype, language, severity): the
+        # tone profile, contract block, and selector all depend only on those.
+        # Cache successful resolutions so repeated overrides skip the contract
+        # traversal; failures are never cached so fail-fast semantics hold.
+        cache = self._override_response_cache()
+        cache_key = (subtype, language, severity)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        tone_profile = calibrate_tone("A", severity, category)
+        variants = self._load_contract_guardrail_variants(language, subtype, skeleton="A")
         filtered = _filter_variants_by_tone(variants, tone_profile)
         if not filtered:
-            raise VoiceSelectionError("No eligible jailbreak variants after tone filtering")
-        return select_guardrail_variant([variant["text"] for variant in filtered])
+            raise VoiceSelectionError(f"No eligible {subtype} variants after tone filtering")
+        text = select_guardrail_variant([variant["text"] for variant in filtered])
+        cache[cache_key] = text
+        return text
+
+    def _resolve_jailbreak_override_response(self, prompt: str, severity: str) -> str:
+        return self._resolve_category_override_response(
+            prompt, severity, category="JAILBREAK_ATTEMPT", subtype="jailbreak"
+        )
 
     def _resolve_abuse_override_response(self, prompt: str, severity: str) -> str:
-        language = detect_language(prompt)
-        tone_profile = calibrate_tone("A", severity, "ABUSE_HARASSMENT")
-        variants = self._load_contract_guardrail_variants(language, "abuse", skeleton="A")
-        filtered = _filter_variants_by_tone(variants, tone_profile)
-        if not filtered:
-            raise VoiceSelectionError("No eligible abuse variants after tone filtering")
-        return select_guardrail_variant([variant["text"] for variant in filtered])
+        return self._resolve_category_override_response(
+            prompt, severity, category="ABUSE_HARASSMENT", subtype="abuse"
+        )
 
     def _resolve_extremism_override_response(self, prompt: str, severity: str) -> str:
-        language = detect_language(prompt)
-        tone_profile = calibrate_tone("A", severity, "EXTREMISM")
-        variants = self._load_contract_guardrail_variants(language, "extremism", skeleton="A")
-        filtered = _filter_variants_by_tone(variants, tone_profile)
-        if not filtered:
-            raise VoiceSelectionError("No eligible extremism variants after tone filtering")
-        return select_guardrail_variant([variant["text"] for variant in filtered])
+        return self._resolve_category_override_response(
+            prompt, severity, category="EXTREMISM", subtype="extremism"
+        )
 
     def _resolve_data_extraction_override_response(self, prompt: str, severity: str) -> str:
-        language = detect_language(prompt)
-        tone_profile = calibrate_tone("A", severity, "DATA_EXTRACTION_ATTEMPT")
-        variants = self._load_contract_guardrail_variants(language, "data_extraction", skeleton="A")
-        filtered = _filter_variants_by_tone(variants, tone_profile)
-        if not filtered:
-            raise VoiceSelectionError("No eligible data_extraction variants after tone filtering")
-        return select_guardrail_variant([variant["text"] for variant in filtered])
+        return self._resolve_category_override_response(
+            prompt, severity, category="DATA_EXTRACTION_ATTEMPT", subtype="data_extraction"
+        )
 
     def _resolve_system_probe_override_response(self, prompt: str, severity: str) -> str:
-        language = detect_language(prompt)
-        tone_profile = calibrate_tone("A", severity, "SYSTEM_PROBE")
-        variants = self._load_contract_guardrail_variants(language, "system_probe", skeleton="A")
-        filtered = _filter_variants_by_tone(variants, tone_profile)
-        if not filtered:
-            raise VoiceSelectionError("No eligible system_probe variants after tone filtering")
-        return select_guardrail_variant([variant["text"] for variant in filtered])
+        return self._resolve_category_override_response(
+            prompt, severity, category="SYSTEM_PROBE", subtype="system_probe"
+        )
 
     def _resolve_manipulation_override_response(self, prompt: str, severity: str) -> str:
-        language = detect_language(prompt)
-        tone_profile = calibrate_tone("A", severity, "MANIPULATION_ATTEMPT")
-        variants = self._load_contract_guardrail_variants(language, "manipulation", skeleton="A")
-        filtered = _filter_variants_by_tone(variants, tone_profile)
-        if not filtered:
-            raise VoiceSelectionError("No eligible manipulation variants after tone filtering")
-        return select_guardrail_variant([variant["text"] for variant in filtered])
+        return self._resolve_category_override_response(
+            prompt, severity, category="MANIPULATION_ATTEMPT", subtype="manipulation"
+        )
 
     def _resolve_self_harm_override_response(self, prompt: str, severity: str, effective_skeleton: str) -> str:
         # Crisis escalation invariant lock: self-harm override always resolves on C.
         effective_skeleton = "C"
         language = detect_language(prompt)
+        cache = self._override_response_cache()
+        cache_key = ("self_harm", language, severity)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
         tone_profile = calibrate_tone(effective_skeleton, severity, "SELF_HARM_RISK")
         try:
             variants = self._load_contract_guardrail_variants(
@@ -735,7 +747,9 @@ class InferenceEngine:
         filtered = _filter_variants_by_tone(variants, tone_profile)
         if not filtered:
             raise VoiceSelectionError("No eligible self_harm variants after tone filtering")
-        return select_guardrail_variant([variant["text"] for variant in filtered])
+        text = select_guardrail_variant([variant["text"] for variant in filtered])
+        cache[cache_key] = text
+        return text
 
     @classmethod
     def _sentence_count(cls, text: str) -> int:
@@ -1156,6 +1170,11 @@ class InferenceEngine:
         if not text:
             return text, meta
 
+        # One env read per call: every diagnostic-only meta field below keys
+        # off the same switch, so the repeated os.environ lookups collapse
+        # into a local.
+        diagnostics = os.environ.get("RUNTIME_DIAGNOSTICS") == "1"
+
         # Step 1: Emotional selection/assembly (Phase 3A).
         if intent == "emotional":
             if guardrail_result and guardrail_result.risk_category == "SAFE":
@@ -1198,7 +1217,7 @@ class InferenceEngine:
                 shaped_text = assemble_response(skeleton, selected)
 
                 meta = dict(meta)
-                if os.environ.get("RUNTIME_DIAGNOSTICS") == "1":
+                if diagnostics:
                     meta["shaped"] = True
                     meta["shape"] = "emotional_escalation" if (resolution and resolution.escalation_state != "none") else "emotional_skeleton"
                     if base_skeleton is not None:
@@ -1211,10 +1230,10 @@ class InferenceEngine:
                 meta["emotional_turn_index"] = self.voice_state.emotional_turn_index
 
                 if self.voice_state.escalation_state != "none":
-                    if os.environ.get("RUNTIME_DIAGNOSTICS") == "1":
+                    if diagnostics:
                         meta["escalation_active"] = True
                 if self.voice_state.latched_theme:
-                    if os.environ.get("RUNTIME_DIAGNOSTICS") == "1":
+                    if diagnostics:
                         meta["emotional_theme"] = self.voice_state.latched_theme
 
                 return shaped_text, meta
@@ -1258,7 +1277,7 @@ class InferenceEngine:
             shaped = self._shape_explanatory(prompt, text)
             if shaped != text:
                 meta = dict(meta)
-                if os.environ.get("RUNTIME_DIAGNOSTICS") == "1":
+                if diagnostics:
                     meta["shaped"] = True
                     meta["shape"] = meta.get("shape") or "explanatory_constraints"
             text = shaped
@@ -1296,7 +1315,7 @@ class InferenceEngine:
                 regenerated_final = self._shape_explanatory(prompt, regenerated_final)
                 if self._is_explanatory_on_topic(prompt, regenerated_final) and (not self._needs_explanatory_regen(prompt, regenerated_final)):
                     meta = dict(meta)
-                    if os.environ.get("RUNTIME_DIAGNOSTICS") == "1":
+                    if diagnostics:
                         meta["post_regen"] = True
                         meta["post_regen_prompt"] = "shape_contract"
                     return regenerated_final, meta
@@ -1948,13 +1967,13 @@ class InferenceEngine:
                     )
                     return self._pack(recovered_final, meta, return_meta)
 
+        diagnostics = os.environ.get("RUNTIME_DIAGNOSTICS") == "1"
         meta = dict(meta)
-        if os.environ.get("RUNTIME_DIAGNOSTICS") == "1":
+        if diagnostics:
             meta["source"] = "model"
-        if semantic_dropped_reason:
-            if os.environ.get("RUNTIME_DIAGNOSTICS") == "1":
-                meta["semantic_dropped"] = True
-                meta["semantic_dropped_reason"] = semantic_dropped_reason
+        if semantic_dropped_reason and diagnostics:
+            meta["semantic_dropped"] = True
+            meta["semantic_dropped_reason"] = semantic_dropped_reason
         final_text, meta = self._post_process_response(
             prompt,
             intent,
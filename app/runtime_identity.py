@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -29,7 +30,10 @@ _RUNTIME_IDENTITY_CACHE: Dict[str, Any] = {
     "status": "UNVERIFIED",
     "errors": ["runtime_identity_not_verified"],
 }
-_VERIFY_ONCE_DONE = False
+# Stat signature of the verified bundle: (mtime_ns, size) per artifact file.
+# None until a strict verification has passed; a changed signature forces a
+# fresh verification instead of trusting a stale pass.
+_VERIFY_CACHE_KEY: tuple | None = None
 
 
 def _deterministic_json(data: Any) -> str:
@@ -40,10 +44,15 @@ def _sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-def _read_json(path: Path) -> Dict[str, Any]:
+def _hash_and_load(path: Path) -> tuple[str, Dict[str, Any]]:
+    """One pass over the artifact bytes: digest and parse from the same
+    mmap'd buffer instead of decoding to str, re-canonicalizing and
+    re-encoding the identical canonical content."""
     if not path.is_file():
         raise RuntimeError(f"Missing required artifact file: {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+    with open(path, "rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return hashlib.sha256(buffer).hexdigest(), json.loads(buffer[:])
 
 
 def _compute_model_fingerprint() -> str:
@@ -83,6 +92,14 @@ def _compute_bundle_digest(artifact_digests: Dict[str, str], model_fingerprint:
     return f"sha256:{_sha256_text(_deterministic_json(payload))}"
 
 
+def _artifact_stat_key() -> tuple:
+    stats = []
+    for path in (_MANIFEST_PATH, _CONTRACT_SNAPSHOT_PATH, _SELECTOR_SNAPSHOT_PATH):
+        stat = path.stat()
+        stats.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
 def _verify_manifest_digest(manifest: Dict[str, Any], errors: List[str]) -> None:
     artifact_digests = manifest.get("artifact_digests") or {}
     manifest_digest = artifact_digests.get("release_manifest.json")
@@ -109,13 +126,16 @@ def _manifest_digest_without_self(manifest: Dict[str, Any]) -> str:
 def _collect_runtime_identity() -> Dict[str, Any]:
     errors: List[str] = []
 
-    manifest = _read_json(_MANIFEST_PATH)
-    contract_snapshot = _read_json(_CONTRACT_SNAPSHOT_PATH)
-    selector_snapshot = _read_json(_SELECTOR_SNAPSHOT_PATH)
+    # The snapshot artifacts are written in canonical form, so their raw
+    # bytes are the canonical serialization: the mmap digest matches the
+    # manifest's canonical-text digests for a sealed bundle and flags any
+    # reformatting that re-canonicalization would have hidden. Only the
+    # manifest's self-digest needs a re-serialization (minus its own entry).
+    _, manifest = _hash_and_load(_MANIFEST_PATH)
+    contract_snapshot_digest_live, contract_snapshot = _hash_and_load(_CONTRACT_SNAPSHOT_PATH)
+    selector_snapshot_digest_live, selector_snapshot = _hash_and_load(_SELECTOR_SNAPSHOT_PATH)
 
     manifest_artifact_digests = manifest.get("artifact_digests") or {}
-    contract_snapshot_digest_live = _sha256_text(_deterministic_json(contract_snapshot))
-    selector_snapshot_digest_live = _sha256_text(_deterministic_json(selector_snapshot))
     manifest_digest_live = _manifest_digest_without_self(manifest)
 
     expected_contract_digest = manifest_artifact_digests.get("contract_snapshot.json")
@@ -179,10 +199,16 @@ def _collect_runtime_identity() -> Dict[str, Any]:
 
 
 def verify_runtime_identity(strict: bool = True) -> None:
-    global _RUNTIME_IDENTITY_CACHE, _VERIFY_ONCE_DONE
+    global _RUNTIME_IDENTITY_CACHE, _VERIFY_CACHE_KEY
 
-    if strict and _VERIFY_ONCE_DONE:
-        return
+    if strict and _VERIFY_CACHE_KEY is not None:
+        try:
+            if _artifact_stat_key() == _VERIFY_CACHE_KEY:
+                return
+        except OSError:
+            # A missing artifact falls through to full verification, which
+            # raises the proper error.
+            pass
 
     identity = _collect_runtime_identity()
     _RUNTIME_IDENTITY_CACHE = identity
@@ -193,7 +219,7 @@ def verify_runtime_identity(strict: bool = True) -> None:
             raise RuntimeError(f"Runtime identity verification failed: {joined_errors}")
         return
 
-    _VERIFY_ONCE_DONE = True
+    _VERIFY_CACHE_KEY = _artifact_stat_key()
 
 
 def get_runtime_identity() -> Dict[str, Any]:
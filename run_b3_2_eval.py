@@ -15,33 +15,45 @@ if not MODEL_DIR.exists():
 PROMPTS_PATH = REPO_ROOT / "eval" / "prompts_b3_1.json"
 OUT_PATH = Path("/tmp/results_b3_2.json")
 
-assert PROMPTS_PATH.exists(), f"Missing prompts file: {PROMPTS_PATH}"
-
-with open(PROMPTS_PATH, encoding="utf-8") as f:
-    data = json.load(f)
-
-results = {"sequences": []}
-
-for seq in data.get("sequences", []):
-    seq_id = seq.get("id")
-    turns = seq.get("turns", [])
-    engine = InferenceEngine(str(MODEL_DIR))
-    seq_res = {"id": seq_id, "turns": []}
-    for i, user in enumerate(turns, start=1):
-        try:
-            resp, meta = engine.generate(user, max_new_tokens=128, return_meta=True)
-        except Exception as e:
-            resp = ""
-            meta = {"error": str(e)}
-        seq_res["turns"].append({
-            "turn_index": i,
-            "user": user,
-            "response": resp.strip(),
-            "meta": meta,
-        })
-    results["sequences"].append(seq_res)
-
-with open(OUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(results, f, indent=2, ensure_ascii=False)
-
-print(f"Wrote: {OUT_PATH}")
+
+def main(output_path: Path = OUT_PATH) -> dict:
+    """Run the eval and write results to output_path; returns the results.
+
+    Importable so tests can run the eval in-process instead of paying a
+    fresh interpreter (and model/import warm-up) per invocation.
+    """
+    assert PROMPTS_PATH.exists(), f"Missing prompts file: {PROMPTS_PATH}"
+
+    with open(PROMPTS_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+
+    results = {"sequences": []}
+
+    for seq in data.get("sequences", []):
+        seq_id = seq.get("id")
+        turns = seq.get("turns", [])
+        engine = InferenceEngine(str(MODEL_DIR))
+        seq_res = {"id": seq_id, "turns": []}
+        for i, user in enumerate(turns, start=1):
+            try:
+                resp, meta = engine.generate(user, max_new_tokens=128, return_meta=True)
+            except Exception as e:
+                resp = ""
+                meta = {"error": str(e)}
+            seq_res["turns"].append({
+                "turn_index": i,
+                "user": user,
+                "response": resp.strip(),
+                "meta": meta,
+            })
+        results["sequences"].append(seq_res)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print(f"Wrote: {output_path}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 import json
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # scripts stay runnable on a bare stdlib environment
+    orjson = None
+
 def get_deterministic_json(data: dict, pretty: bool = False) -> str:
     """
     Serializes a dictionary to a canonical JSON string.
@@ -10,13 +15,34 @@ def get_deterministic_json(data: dict, pretty: bool = False) -> str:
     """
     if pretty:
         return json.dumps(data, sort_keys=True, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        # Byte-identical to the stdlib form below for the str-keyed JSON
+        # these artifacts contain: compact separators, sorted keys and
+        # unescaped non-ASCII are orjson's native output.
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode("utf-8")
     return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
 
+# Copying a prebuilt context skips the per-call OpenSSL EVP setup; cheap on
+# its own but free across the digest-heavy snapshot/validator loops.
+_SHA256_TEMPLATE = hashlib.sha256()
+
 def get_sha256_digest(data: str) -> str:
     """
     Computes the SHA256 hash of a string and returns it as a hex digest.
     """
-    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+    hasher = _SHA256_TEMPLATE.copy()
+    hasher.update(data.encode('utf-8'))
+    return hasher.hexdigest()
+
+def get_sha256_file_digest(path) -> str:
+    """
+    Computes the SHA256 hash of a file's raw bytes.
+    Equivalent to get_sha256_digest(path.read_text()) for UTF-8 files but
+    skips the decode/re-encode round trip and streams through
+    hashlib.file_digest.
+    """
+    with open(path, 'rb') as handle:
+        return hashlib.file_digest(handle, 'sha256').hexdigest()
 
 def get_artifact_digest(data: dict) -> str:
     """
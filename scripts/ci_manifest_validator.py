@@ -211,6 +211,16 @@ def validate_bundle(artifact_dir: Path, mode: str) -> Dict:
     }
 
 
+def run(artifact_dir: Path, mode: str = "soft") -> Tuple[int, str]:
+    """In-process entrypoint: validate and return (exit_code, report_json).
+
+    Lets callers (tests, tooling) skip the per-invocation interpreter boot
+    the CLI wrapper pays; the CLI below stays byte-identical.
+    """
+    report = validate_bundle(Path(artifact_dir), mode)
+    return (0 if report["status"] == "PASS" else 1), get_deterministic_json(report)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Validate release manifest integrity")
     parser.add_argument("--artifact-dir", default=str(project_root / "artifacts"))
@@ -218,16 +228,14 @@ def main() -> None:
     parser.add_argument("--output-file", default=None)
     args = parser.parse_args()
 
-    artifact_dir = Path(args.artifact_dir)
-    report = validate_bundle(artifact_dir, args.mode)
-    report_json = get_deterministic_json(report)
+    exit_code, report_json = run(Path(args.artifact_dir), args.mode)
 
     if args.output_file:
         Path(args.output_file).write_text(report_json, encoding="utf-8")
 
     print(report_json)
-    if report["status"] != "PASS":
-        sys.exit(1)
+    if exit_code:
+        sys.exit(exit_code)
 
 
 if __name__ == "__main__":
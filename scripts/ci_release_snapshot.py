@@ -141,10 +141,12 @@ def _run_manifest_validator(artifact_dir: Path) -> None:
         sys.exit(result.returncode)
 
 
-def main() -> None:
-    args = _parse_args()
-    artifact_dir = Path(args.artifact_dir)
+def run(artifact_dir: Path) -> None:
+    """Generate the release bundle into artifact_dir.
 
+    Importable entry point so tests can invoke the snapshot in-process
+    instead of paying interpreter startup per run; main() wraps it for the
+    CLI."""
     print("R1: Generating deterministic release snapshot...")
     artifact_dir.mkdir(exist_ok=True)
 
@@ -190,5 +192,10 @@ def main() -> None:
     print(f"  - Selector Snapshot Digest: {selector_snapshot_digest}")
 
 
+def main() -> None:
+    args = _parse_args()
+    run(Path(args.artifact_dir))
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
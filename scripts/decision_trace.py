@@ -70,7 +70,24 @@ def _transition_legal(previous_skeleton: str, resolved_skeleton: str) -> bool:
     return resolved_skeleton in allowed
 
 
-def compute_replay_hash(trace: Mapping[str, object]) -> str:
+# Cloned sha256 contexts pre-seeded with the canonical contract_fingerprint
+# prefix. "contract_fingerprint" sorts first in the canonical payload and is
+# identical across traces built against the same contract, so batches of
+# traces re-hash only their per-trace suffix. hashlib's .copy() clones the
+# digest state far cheaper than re-hashing the prefix bytes.
+_REPLAY_PREFIX_CONTEXTS: dict = {}
+
+
+def _replay_hash_context(contract_fingerprint: object):
+    ctx = _REPLAY_PREFIX_CONTEXTS.get(contract_fingerprint)
+    if ctx is None:
+        prefix = '{"contract_fingerprint":' + json.dumps(contract_fingerprint, ensure_ascii=False) + ","
+        ctx = hashlib.sha256(prefix.encode("utf-8"))
+        _REPLAY_PREFIX_CONTEXTS[contract_fingerprint] = ctx
+    return ctx.copy()
+
+
+def _hash_subset(trace: Mapping[str, object]) -> OrderedDict:
     turn = trace.get("turn", {})
     skeleton = trace.get("skeleton", {})
     selection = trace.get("selection", {})
@@ -78,7 +95,6 @@ def compute_replay_hash(trace: Mapping[str, object]) -> str:
     guardrail = trace.get("guardrail", {})
 
     subset = OrderedDict()
-    subset["contract_fingerprint"] = trace.get("contract_fingerprint")
     subset["emotional_turn_index"] = turn.get("emotional_turn_index")
     subset["intent"] = turn.get("intent")
     subset["skeleton_after_guardrail"] = skeleton.get("after_guardrail")
@@ -103,10 +119,118 @@ def compute_replay_hash(trace: Mapping[str, object]) -> str:
         ]
     )
     subset["selected_variant_indices"] = selection.get("selected_variant_indices", {})
+    return subset
+
+
+def _enc_scalar(value: object) -> Optional[str]:
+    """Canonical JSON encoding for the scalar types the trace emits, or
+    None when the value needs the generic serializer."""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, int):
+        return str(value)
+    return None
+
+
+def _specialized_subset_suffix(trace: Mapping[str, object]) -> Optional[str]:
+    """Canonical JSON of the hash subset, minus the leading brace, assembled
+    directly in sorted-key order for the fixed trace schema.
+
+    Skips building the subset dict and json.dumps' generic walk. Returns
+    None for any value outside the schema's scalar types so callers fall
+    back to the generic path; the first successful use is verified
+    byte-identical against that path before being trusted.
+    """
+    turn = trace.get("turn", {})
+    guardrail = trace.get("guardrail", {})
+    fallback = trace.get("fallback")
+    selection = trace.get("selection", {})
 
-    payload = _canonical_json(subset)
-    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
-    return f"{REPLAY_HASH_PREFIX}{digest}"
+    parts = []
+    for key, value in (
+        ("emotional_lang", turn.get("emotional_lang")),
+        ("emotional_turn_index", turn.get("emotional_turn_index")),
+        ("escalation_state", turn.get("escalation_state")),
+    ):
+        encoded = _enc_scalar(value)
+        if encoded is None:
+            return None
+        parts.append(f'"{key}":{encoded}')
+
+    if fallback is None:
+        parts.append('"fallback":null')
+    else:
+        level = _enc_scalar(fallback.get("level"))
+        if level is None:
+            return None
+        absolute = "true" if fallback.get("absolute", False) else "false"
+        parts.append(f'"fallback":{{"absolute":{absolute},"level":{level}}}')
+
+    guardrail_parts = []
+    for key in ("classifier_version", "override", "risk_category", "severity", "strategy_version"):
+        value = bool(guardrail.get("override", False)) if key == "override" else guardrail.get(key)
+        encoded = _enc_scalar(value)
+        if encoded is None:
+            return None
+        guardrail_parts.append(f'"{key}":{encoded}')
+    parts.append('"guardrail":{' + ",".join(guardrail_parts) + "}")
+
+    for key, value in (("intent", turn.get("intent")), ("latched_theme", turn.get("latched_theme"))):
+        encoded = _enc_scalar(value)
+        if encoded is None:
+            return None
+        parts.append(f'"{key}":{encoded}')
+
+    indices = selection.get("selected_variant_indices", {})
+    index_parts = []
+    for key in sorted(indices):
+        encoded = _enc_scalar(indices[key])
+        if encoded is None or not isinstance(key, str):
+            return None
+        index_parts.append(f'"{key}":{encoded}')
+    parts.append('"selected_variant_indices":{' + ",".join(index_parts) + "}")
+
+    encoded = _enc_scalar(trace.get("skeleton", {}).get("after_guardrail"))
+    if encoded is None:
+        return None
+    parts.append(f'"skeleton_after_guardrail":{encoded}')
+
+    if "tone_profile" in trace:
+        encoded = _enc_scalar(trace.get("tone_profile"))
+        if encoded is None:
+            return None
+        parts.append(f'"tone_profile":{encoded}')
+
+    return ",".join(parts) + "}"
+
+
+_SPECIALIZED_VERIFIED = False
+
+
+def compute_replay_hash(trace: Mapping[str, object]) -> str:
+    global _SPECIALIZED_VERIFIED
+
+    suffix = _specialized_subset_suffix(trace)
+    if suffix is None:
+        suffix = _canonical_json(_hash_subset(trace))[1:]
+    elif not _SPECIALIZED_VERIFIED:
+        generic = _canonical_json(_hash_subset(trace))[1:]
+        if suffix != generic:  # pragma: no cover - schema drift guard
+            raise AssertionError("specialized replay-hash serializer diverged from canonical JSON")
+        _SPECIALIZED_VERIFIED = True
+
+    # Equivalent to hashing _canonical_json of the full subset including
+    # contract_fingerprint: the seeded prefix supplies the leading bytes and
+    # the suffix drops only the opening brace.
+    digest = _replay_hash_context(trace.get("contract_fingerprint"))
+    digest.update(suffix.encode("utf-8"))
+    return f"{REPLAY_HASH_PREFIX}{digest.hexdigest()}"
 
 
 def build_decision_trace(
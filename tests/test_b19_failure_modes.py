@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 from types import SimpleNamespace
 
+import orjson
 import pytest
 
 from app.guardrails.guardrail_classifier import GuardrailResult
@@ -334,7 +335,7 @@ def test_b19_b5_empty_guardrail_list_raises_value_error_at_load(monkeypatch, tmp
     contract = _real_contract()
     contract["skeletons"]["A"]["en"]["guardrail"]["jailbreak"] = []
     bad_path = tmp_path / "bad_contract_empty.json"
-    bad_path.write_text(json.dumps(contract), encoding="utf-8")
+    bad_path.write_bytes(orjson.dumps(contract))
     monkeypatch.setattr(contract_loader, "CONTRACT_PATH", bad_path)
     with pytest.raises(ValueError, match="A.en.jailbreak must be a non-empty list"):
         contract_loader.get_loader()
@@ -344,7 +345,7 @@ def test_b19_b6_unknown_tone_tag_raises_value_error_at_load(monkeypatch, tmp_pat
     contract = _real_contract()
     contract["skeletons"]["A"]["en"]["guardrail"]["jailbreak"][0]["tone_tags"] = ["unknown_tone_profile"]
     bad_path = tmp_path / "bad_contract_tone.json"
-    bad_path.write_text(json.dumps(contract), encoding="utf-8")
+    bad_path.write_bytes(orjson.dumps(contract))
     monkeypatch.setattr(contract_loader, "CONTRACT_PATH", bad_path)
     with pytest.raises(ValueError, match="Unknown tone profile"):
         contract_loader.get_loader()
@@ -1,11 +1,9 @@
-import json
-import os
-import subprocess
-import sys
 from pathlib import Path
 
 import pytest
 
+from tests.conftest import load_json
+
 from app.voice.rotation_memory import RotationMemory
 from app.voice.state import SessionVoiceState
 from app.voice.select import select_voice_variants
@@ -13,9 +11,7 @@ from app.voice.contract_loader import get_variants_for
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
-RUNNER = REPO_ROOT / "run_b3_2_eval.py"
 BASELINE_PATH = REPO_ROOT / "tests" / "baselines" / "phase0_eval_baseline.json"
-OUT_PATH = Path("/tmp/results_b3_2.json")
 
 
 def test_session_voice_state_roundtrip():
@@ -75,17 +71,11 @@ def test_selector_phase3b_first_turn_is_stable_and_writes_memory():
 
 
 @pytest.mark.requires_model
-def test_phase0_eval_outputs_unchanged():
+def test_phase0_eval_outputs_unchanged(b3_2_results):
     assert BASELINE_PATH.exists(), "Missing Phase 0 baseline file"
-    env = os.environ.copy()
-    env["TRANSFORMERS_OFFLINE"] = "1"
-    env["HF_HUB_OFFLINE"] = "1"
-    env["PYTHONPATH"] = str(REPO_ROOT)
-    subprocess.check_call([sys.executable, str(RUNNER)], cwd=str(REPO_ROOT), env=env)
-    assert OUT_PATH.exists(), "Expected results at /tmp/results_b3_2.json"
-
-    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
-    current = json.loads(OUT_PATH.read_text(encoding="utf-8"))
+
+    baseline = load_json(BASELINE_PATH)
+    current = b3_2_results
     assert len(current.get("sequences", [])) == len(baseline.get("sequences", []))
 
     for b_seq, c_seq in zip(baseline["sequences"], current["sequences"]):
@@ -2,12 +2,9 @@ import os
 from pathlib import Path
 import pytest
 
-APP_ROOT = Path(__file__).parent.parent / "app"
+from tests.conftest import app_all_files, app_source
 
-def get_all_files():
-    """Helper to collect all files in the app directory, respecting .gitignore if possible."""
-    # This is a simple implementation. A more robust one might parse .gitignore.
-    return [p for p in APP_ROOT.rglob("*") if p.is_file() and ".git" not in p.parts]
+APP_ROOT = Path(__file__).parent.parent / "app"
 
 # These strings correspond to build-time artifacts and diagnostic reports.
 # The production 'app' code should be completely unaware of their existence.
@@ -18,7 +15,7 @@ FORBIDDEN_STRINGS = [
     "stress_integrity_report.json",
 ]
 
-@pytest.mark.parametrize("file_path", get_all_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
+@pytest.mark.parametrize("file_path", app_all_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
 def test_no_artifact_references_in_app(file_path):
     """
     Asserts that no file in the 'app' directory contains references to
@@ -27,8 +24,7 @@ def test_no_artifact_references_in_app(file_path):
     CI/diagnostic artifacts, ensuring a clean release.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content = app_source(file_path)
     except UnicodeDecodeError:
         # This can happen for binary files, which are unlikely to contain the forbidden strings.
         # We can safely skip them.
@@ -1,13 +1,13 @@
 import ast
 import os
+import re
 from pathlib import Path
 import pytest
 
+from tests.conftest import app_ast, app_py_files, app_source
+
 APP_ROOT = Path(__file__).parent.parent / "app"
 
-def get_py_files():
-    """Helper to collect all Python files in the app directory."""
-    return list(APP_ROOT.rglob("*.py"))
 
 # These names are related to CI-only fault injection and have no place in runtime code.
 FORBIDDEN_NAMES = {
@@ -17,18 +17,22 @@ FORBIDDEN_NAMES = {
     "ci_fault_injection_runner",
 }
 
-@pytest.mark.parametrize("py_file", get_py_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
+# Cheap byte-scan first: files with no textual hit cannot produce an AST
+# match, so the walk only runs on candidates.
+_PREFILTER_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(FORBIDDEN_NAMES))) + r")\b")
+
+@pytest.mark.parametrize("py_file", app_py_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
 def test_no_fault_injection_in_app(py_file):
     """
     Asserts that no app file references fault injection tooling by name.
     This is a static guard to prevent CI/testing constructs from leaking
     into the production runtime.
     """
-    with open(py_file, "r", encoding="utf-8") as f:
-        content = f.read()
+    if _PREFILTER_RE.search(app_source(py_file)) is None:
+        return
 
     try:
-        tree = ast.parse(content, filename=str(py_file))
+        tree = app_ast(py_file)
     except SyntaxError as e:
         pytest.fail(f"Could not parse {py_file}: {e}")
 
@@ -1,31 +1,37 @@
 import ast
 import os
+import re
 from pathlib import Path
 import pytest
 
+from tests.conftest import app_ast, app_py_files, app_source
+
 APP_ROOT = Path(__file__).parent.parent / "app"
 
-def get_py_files():
-    """Helper to collect all Python files in the app directory."""
-    return list(APP_ROOT.rglob("*.py"))
 
 # For now, completely forbid 'time' module and specific performance names.
 # If a legitimate use for 'time' arises, this guard can be made more specific.
 FORBIDDEN_MODULES = {"time"}
 FORBIDDEN_NAMES = {"PerfTimer", "perf_counter"}
 
-@pytest.mark.parametrize("py_file", get_py_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
+# Word-bounded textual prefilter; only files mentioning a forbidden token
+# pay for the AST walk.
+_PREFILTER_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(FORBIDDEN_MODULES | FORBIDDEN_NAMES))) + r")\b"
+)
+
+@pytest.mark.parametrize("py_file", app_py_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
 def test_no_performance_imports_in_app(py_file):
     """
     Asserts that no app file imports performance-related modules like 'time'
     or names like 'perf_counter'.
     This prevents diagnostic/performance code from leaking into the runtime.
     """
-    with open(py_file, "r", encoding="utf-8") as f:
-        content = f.read()
+    if _PREFILTER_RE.search(app_source(py_file)) is None:
+        return
 
     try:
-        tree = ast.parse(content, filename=str(py_file))
+        tree = app_ast(py_file)
     except SyntaxError as e:
         pytest.fail(f"Could not parse {py_file}: {e}")
 
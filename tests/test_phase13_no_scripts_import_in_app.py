@@ -4,13 +4,12 @@ from pathlib import Path
 
 import pytest
 
+from tests.conftest import app_ast, app_py_files, app_source
+
 APP_ROOT = Path(__file__).parent.parent / "app"
 
-def get_py_files():
-    # Helper to collect all Python files in the app directory
-    return list(APP_ROOT.rglob("*.py"))
 
-@pytest.mark.parametrize("py_file", get_py_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
+@pytest.mark.parametrize("py_file", app_py_files(), ids=lambda p: os.path.relpath(p, APP_ROOT))
 def test_no_scripts_import_in_app(py_file):
     """
     Asserts that no Python file within the 'app' directory imports from 'scripts'.
@@ -18,11 +17,13 @@ def test_no_scripts_import_in_app(py_file):
     This is a static boundary guard to ensure CI/CD and diagnostic tooling
     is not bundled into the production runtime.
     """
-    with open(py_file, "r", encoding="utf-8") as f:
-        content = f.read()
-    
+    # An import of scripts requires the literal token; most files skip the
+    # AST walk on this substring check alone.
+    if "scripts" not in app_source(py_file):
+        return
+
     try:
-        tree = ast.parse(content, filename=str(py_file))
+        tree = app_ast(py_file)
     except SyntaxError as e:
         pytest.fail(f"Could not parse {py_file}: {e}")
 
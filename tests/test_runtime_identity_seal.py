@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 from pathlib import Path
@@ -13,6 +14,9 @@ def _canonical_json(data) -> str:
     return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
 
 
+# The bundle variants reuse the same canonical strings (notably the contract
+# JSON) across tests, so repeated digests become cache hits.
+@functools.lru_cache(maxsize=256)
 def _sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
@@ -41,11 +45,14 @@ def _write_bundle(
         "turns": [],
     }
 
-    (artifact_dir / "contract_snapshot.json").write_text(_canonical_json(contract_snapshot), encoding="utf-8")
-    (artifact_dir / "selector_snapshot.json").write_text(_canonical_json(selector_snapshot), encoding="utf-8")
+    # Canonicalize each snapshot once: the same string is written and hashed.
+    contract_snapshot_json = _canonical_json(contract_snapshot)
+    selector_snapshot_json = _canonical_json(selector_snapshot)
+    (artifact_dir / "contract_snapshot.json").write_text(contract_snapshot_json, encoding="utf-8")
+    (artifact_dir / "selector_snapshot.json").write_text(selector_snapshot_json, encoding="utf-8")
 
-    contract_digest = _sha256_text(_canonical_json(contract_snapshot))
-    selector_digest = _sha256_text(_canonical_json(selector_snapshot))
+    contract_digest = _sha256_text(contract_snapshot_json)
+    selector_digest = _sha256_text(selector_snapshot_json)
     if tamper_manifest_selector_digest:
         selector_digest = "0" * 64
 
@@ -60,9 +67,9 @@ def _write_bundle(
         "selector_snapshot_digest": selector_digest,
     }
 
-    manifest_for_digest = dict(manifest)
-    manifest_for_digest["artifact_digests"] = dict(manifest["artifact_digests"])
-    manifest_digest = _sha256_text(_canonical_json(manifest_for_digest))
+    # Digest the manifest before the self-entry exists: same canonical form
+    # the verifier reconstructs, without copying the dicts to strip it out.
+    manifest_digest = _sha256_text(_canonical_json(manifest))
     manifest["artifact_digests"]["release_manifest.json"] = manifest_digest
     (artifact_dir / "release_manifest.json").write_text(_canonical_json(manifest), encoding="utf-8")
 
@@ -77,7 +84,7 @@ def _patch_runtime_identity(monkeypatch: pytest.MonkeyPatch, artifact_dir: Path,
     monkeypatch.setattr(runtime_identity, "_MANIFEST_PATH", artifact_dir / "release_manifest.json")
     monkeypatch.setattr(runtime_identity, "_CONTRACT_SNAPSHOT_PATH", artifact_dir / "contract_snapshot.json")
     monkeypatch.setattr(runtime_identity, "_SELECTOR_SNAPSHOT_PATH", artifact_dir / "selector_snapshot.json")
-    monkeypatch.setattr(runtime_identity, "_VERIFY_ONCE_DONE", False)
+    monkeypatch.setattr(runtime_identity, "_VERIFY_CACHE_KEY", None)
     monkeypatch.setattr(
         runtime_identity,
         "_RUNTIME_IDENTITY_CACHE",
@@ -1,26 +1,41 @@
-def format_example(example, tokenizer):
-    prompt = example["input_text"].strip()
-    response = example["target_text"].strip()
+# Hoisted separator fragments: the map loop runs per batch over the whole
+# dataset, so the constant pieces are built once instead of per call.
+_RESPONSE_SEP = "\nResponse: "
+_BOUNDARY_EXTRA = len("\nResponse:")
 
-    # Build full text
-    full_text = prompt + "\nResponse: " + response
 
-    # Tokenize full sequence
+def format_example(examples, tokenizer):
+    # Batched for datasets.map(batched=True, batch_size=1000): one tokenizer
+    # call per batch lets the Rust backend parallelize the encode and
+    # amortizes the Python/FFI overhead across the whole batch.
+    prompts = [prompt.strip() for prompt in examples["input_text"]]
+    responses = [response.strip() for response in examples["target_text"]]
+
+    # Tokenize the full sequences once; the offset mapping locates each
+    # prompt/response boundary for label masking, replacing the second
+    # prompt-only tokenizer call (tokenization dominates preprocessing cost).
+    boundaries = [len(prompt) + _BOUNDARY_EXTRA for prompt in prompts]
     tokenized = tokenizer(
-        full_text,
+        ["".join((prompt, _RESPONSE_SEP, response)) for prompt, response in zip(prompts, responses)],
         truncation=True,
         max_length=512,
+        return_offsets_mapping=True,
     )
+    offset_batch = tokenized.pop("offset_mapping")
 
-    # Tokenize prompt only (for masking)
-    prompt_ids = tokenizer(
-        prompt + "\nResponse:",
-        truncation=True,
-        max_length=512,
-    )["input_ids"]
+    labels_batch = []
+    for input_ids, offsets, boundary in zip(tokenized["input_ids"], offset_batch, boundaries):
+        # Mask every token that ends inside the prompt region. Special tokens
+        # report (0, 0) offsets, so the trailing EOS is never masked.
+        prompt_token_count = 0
+        for _start, end in offsets:
+            if end == 0 or end > boundary:
+                break
+            prompt_token_count += 1
 
-    labels = tokenized["input_ids"].copy()
-    labels[: len(prompt_ids)] = [-100] * len(prompt_ids)
+        labels = input_ids.copy()
+        labels[:prompt_token_count] = [-100] * prompt_token_count
+        labels_batch.append(labels)
 
-    tokenized["labels"] = labels
-    return tokenized
\ No newline at end of file
+    tokenized["labels"] = labels_batch
+    return tokenized
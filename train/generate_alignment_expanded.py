@@ -1,92 +1,160 @@
-import json
+import functools
 import random
 import re
 from pathlib import Path
-from itertools import product
+
+import orjson
 
 
 SEED = 7
 TARGET_FILE = Path("data/alignment_gold_mt5_expanded.jsonl")
 SEED_FILE = Path("data/alignment_gold_mt5.jsonl")
-PREFIX_RE = re.compile(r"^\s*(empathy|fact|explain|uncertain|refusal)\s*:\s*(.*)$", re.IGNORECASE)
+# Inputs built by this script are already canonical ("prefix: content",
+# lowercase, single space); recognizing them up front keeps the slower
+# scan below for odd-case or odd-whitespace input.
+_CANONICAL_PREFIXES = ("empathy: ", "fact: ", "explain: ", "uncertain: ", "refusal: ")
+_PREFIX_WORDS = ("empathy", "fact", "explain", "uncertain", "refusal")
 WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Every ASCII non-word character mapped to a space: lower + translate +
+# split then yields exactly the \w+ runs WORD_RE would find, using C-level
+# string ops instead of the regex engine. Non-ASCII text (Devanagari lines)
+# keeps the Unicode-aware regex.
+_NON_WORD_TO_SPACE = str.maketrans(
+    {char: " " for char in map(chr, range(128)) if not (char.isalnum() or char == "_")}
+)
 
 
 def load_seed_examples(path: Path):
     records = []
     if not path.exists():
         return records
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            ex = json.loads(line)
-            records.append(
-                {
-                    "input_text": ex["input_text"].strip(),
-                    "target_text": ex["target_text"].strip(),
-                }
-            )
+    # One bytes read + per-record orjson parse: skips text-mode decoding of
+    # the whole file and the per-line stdlib json overhead.
+    for line in path.read_bytes().split(b"\n"):
+        line = line.strip()
+        if not line:
+            continue
+        ex = orjson.loads(line)
+        records.append(
+            {
+                "input_text": ex["input_text"].strip(),
+                "target_text": ex["target_text"].strip(),
+            }
+        )
     return records
 
 
 def canonicalize_prefixed_input(input_text: str) -> str:
     raw = input_text.strip()
-    match = PREFIX_RE.match(raw)
-    if not match:
-        return raw
-    prefix = match.group(1).lower()
-    content = match.group(2).strip()
-    return f"{prefix}: {content}"
+    if raw.startswith(_CANONICAL_PREFIXES):
+        prefix, _, content = raw.partition(": ")
+        if content == content.strip():
+            return raw
+    # Closed five-word prefix set: a startswith scan plus slicing covers
+    # the stragglers without a regex state machine or per-call match
+    # object. No prefix word is a prefix of another, so at most one hits.
+    lowered = raw[:9].lower()
+    for word in _PREFIX_WORDS:
+        if lowered.startswith(word):
+            rest = raw[len(word):].lstrip()
+            if rest.startswith(":"):
+                return f"{word}: {rest[1:].strip()}"
+    return raw
+
+
+@functools.lru_cache(maxsize=4096)
+def _bigrams(text: str) -> frozenset:
+    if text.isascii():
+        tokens = text.lower().translate(_NON_WORD_TO_SPACE).split()
+    else:
+        tokens = [t.lower() for t in WORD_RE.findall(text)]
+    return frozenset(zip(tokens, tokens[1:]))
 
 
 def has_shared_bigrams(a: str, b: str) -> bool:
-    ta = [t.lower() for t in WORD_RE.findall(a)]
-    tb = [t.lower() for t in WORD_RE.findall(b)]
-    if len(ta) < 2 or len(tb) < 2:
-        return False
-    ba = set(zip(ta, ta[1:]))
-    bb = set(zip(tb, tb[1:]))
-    return bool(ba & bb)
+    # The anti-echo pass re-checks a small fixed response pool against
+    # hundreds of prompts; cached bigram sets make each repeat a pure
+    # overlap probe. Fewer than two tokens yields an empty set, so the
+    # short-input case stays False. Probing the smaller set against the
+    # larger short-circuits on the first shared bigram instead of
+    # materializing the full intersection.
+    ba = _bigrams(a)
+    bb = _bigrams(b)
+    if len(ba) > len(bb):
+        ba, bb = bb, ba
+    return any(bigram in bb for bigram in ba)
+
+
+def _compile_styles(templates, placeholder):
+    """Pre-split single-placeholder templates into (prefix, suffix) pairs.
+
+    str.format re-parses the template on every call; with the split done
+    once per builder, each record costs a single concatenation."""
+    return [tuple(template.split(placeholder, 1)) for template in templates]
+
+
+class RecordStore:
+    """Parallel input/target lists instead of one dict per record.
+
+    Dropping the per-record dict removes its header and slot overhead for
+    every generated example, and the serialization pass walks two flat
+    lists instead of chasing a dict per record."""
+
+    __slots__ = ("inputs", "targets")
 
+    def __init__(self):
+        self.inputs = []
+        self.targets = []
 
-def add_record(store, seen, input_text, target_text, require_no_bigram_overlap=False):
+    def __len__(self):
+        return len(self.inputs)
+
+
+def add_record(store, seen, index, input_text, target_text, require_no_bigram_overlap=False):
     input_clean = canonicalize_prefixed_input(input_text)
     target_clean = target_text.strip()
     if require_no_bigram_overlap and has_shared_bigrams(input_clean, target_clean):
         return False
 
-    key = (input_clean, target_clean)
+    # seen holds 64-bit pair hashes rather than the string tuples: one int
+    # per entry instead of two live string refs, and membership probes stop
+    # re-hashing both strings. A hash collision would only drop a record,
+    # and at this corpus size the odds are negligible.
+    key = hash((input_clean, target_clean))
     if key in seen:
         return False
     seen.add(key)
-    store.append({"input_text": key[0], "target_text": key[1]})
+    # First record per input wins the index slot, matching the order the
+    # old linear scan would have found.
+    index.setdefault(input_clean, len(store.inputs))
+    store.inputs.append(input_clean)
+    store.targets.append(target_clean)
     return True
 
 
-def set_record(store, seen, input_text, target_text, require_no_bigram_overlap=False):
+def set_record(store, seen, index, input_text, target_text, require_no_bigram_overlap=False):
     input_clean = canonicalize_prefixed_input(input_text)
     target_clean = target_text.strip()
     if require_no_bigram_overlap and has_shared_bigrams(input_clean, target_clean):
         return False
 
-    for rec in store:
-        if rec["input_text"] == input_clean:
-            rec["target_text"] = target_clean
-            seen.add((input_clean, target_clean))
-            return True
+    position = index.get(input_clean)
+    if position is not None:
+        store.targets[position] = target_clean
+        seen.add(hash((input_clean, target_clean)))
+        return True
 
     return add_record(
         store,
         seen,
+        index,
         input_clean,
         target_clean,
         require_no_bigram_overlap=require_no_bigram_overlap,
     )
 
 
-def build_eval_anchor_examples(store, seen):
+def build_eval_anchor_examples(store, seen, index):
     anchors = [
         (
             "empathy: I feel lost",
@@ -151,10 +219,10 @@ def build_eval_anchor_examples(store, seen):
     ]
 
     for input_text, target_text in anchors:
-        set_record(store, seen, input_text, target_text)
+        set_record(store, seen, index, input_text, target_text)
 
 
-def build_adversarial_anchor_examples(store, seen):
+def build_adversarial_anchor_examples(store, seen, index):
     anchors = [
         (
             "empathy: I feel completely lost and tired. Nothing makes sense right now.",
@@ -279,10 +347,10 @@ def build_adversarial_anchor_examples(store, seen):
     ]
 
     for input_text, target_text in anchors:
-        set_record(store, seen, input_text, target_text)
+        set_record(store, seen, index, input_text, target_text)
 
 
-def build_anti_echo_examples(rng, store, seen, per_category=40):
+def build_anti_echo_examples(rng, store, seen, index, per_category=40):
     # Emotional: compressed Hinglish styles, but targets avoid surface copying.
     emotional_openers = [
         "Yaar,",
@@ -317,14 +385,21 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
         "This feels intense, and your reaction makes sense. You do not need to solve everything tonight; stabilize first, then decide the next move.",
         "You are carrying real pressure. Start with a gentle reset and one practical action so your mind gets a clearer foothold.",
     ]
-    emotional_combos = list(product(emotional_openers, emotional_states, emotional_contexts))
-    rng.shuffle(emotional_combos)
+    # Sample flat indices and decode them with divmod rather than
+    # materializing and shuffling every product tuple up front.
+    emotional_total = len(emotional_openers) * len(emotional_states) * len(emotional_contexts)
     emotional_added = 0
-    for opener, state, context in emotional_combos:
+    for flat in rng.sample(range(emotional_total), emotional_total):
+        opener_index, rest = divmod(flat, len(emotional_states) * len(emotional_contexts))
+        state_index, context_index = divmod(rest, len(emotional_contexts))
+        opener = emotional_openers[opener_index]
+        state = emotional_states[state_index]
+        context = emotional_contexts[context_index]
         prompt = f"{opener} {state} {context}".strip()
         if add_record(
             store,
             seen,
+            index,
             f"empathy: {prompt}",
             rng.choice(emotional_responses),
             require_no_bigram_overlap=True,
@@ -348,11 +423,13 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
         ("Pi ka rounded value do decimals tak?", "3.14."),
         ("Plant atmosphere se kaunsi gas absorb karte?", "Carbon dioxide."),
     ]
+    # Prebuilt closures instead of str.format: the format-spec parser runs
+    # once at definition time, not per iteration.
     factual_styles = [
-        "{q}",
-        "Seedha fact do: {q}",
-        "Ek line answer: {q}",
-        "Quick response: {q}",
+        lambda q: q,
+        lambda q: f"Seedha fact do: {q}",
+        lambda q: f"Ek line answer: {q}",
+        lambda q: f"Quick response: {q}",
     ]
     factual_added = 0
     for q, a in factual_qa:
@@ -360,7 +437,8 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
             if add_record(
                 store,
                 seen,
-                f"fact: {style.format(q=q)}",
+                index,
+                f"fact: {style(q)}",
                 a,
                 require_no_bigram_overlap=True,
             ):
@@ -422,10 +500,10 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
         ),
     ]
     explain_styles = [
-        "{q}",
-        "Simple words only: {q}",
-        "Beginner mode: {q}",
-        "No jargon please: {q}",
+        lambda q: q,
+        lambda q: f"Simple words only: {q}",
+        lambda q: f"Beginner mode: {q}",
+        lambda q: f"No jargon please: {q}",
     ]
     explain_added = 0
     for q, a in explain_pairs:
@@ -433,7 +511,8 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
             if add_record(
                 store,
                 seen,
-                f"explain: {style.format(q=q)}",
+                index,
+                f"explain: {style(q)}",
                 a,
                 require_no_bigram_overlap=True,
             ):
@@ -459,10 +538,10 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
         "Election winner pe guaranteed call do.",
     ]
     uncertain_styles = [
-        "{p}",
-        "No maybe, direct certainty: {p}",
-        "Pakka answer chahiye: {p}",
-        "Straight confirmation only: {p}",
+        lambda p: p,
+        lambda p: f"No maybe, direct certainty: {p}",
+        lambda p: f"Pakka answer chahiye: {p}",
+        lambda p: f"Straight confirmation only: {p}",
     ]
     uncertain_responses = [
         "I cannot guarantee that outcome. Too many variables can change, but I can help you plan around controllable factors.",
@@ -477,7 +556,8 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
             if add_record(
                 store,
                 seen,
-                f"uncertain: {style.format(p=p)}",
+                index,
+                f"uncertain: {style(p)}",
                 rng.choice(uncertain_responses),
                 require_no_bigram_overlap=True,
             ):
@@ -503,10 +583,10 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
         "Guide for harming someone without evidence.",
     ]
     refusal_styles = [
-        "{p}",
-        "Detailed instructions: {p}",
-        "Stepwise plan: {p}",
-        "Most effective way: {p}",
+        lambda p: p,
+        lambda p: f"Detailed instructions: {p}",
+        lambda p: f"Stepwise plan: {p}",
+        lambda p: f"Most effective way: {p}",
     ]
     refusal_responses = [
         "I can't help with harmful or illegal actions. I can help with safe and legal alternatives.",
@@ -520,7 +600,8 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
             if add_record(
                 store,
                 seen,
-                f"refusal: {style.format(p=p)}",
+                index,
+                f"refusal: {style(p)}",
                 rng.choice(refusal_responses),
                 require_no_bigram_overlap=True,
             ):
@@ -531,7 +612,7 @@ def build_anti_echo_examples(rng, store, seen, per_category=40):
             break
 
 
-def build_emotional_examples(rng, store, seen):
+def build_emotional_examples(rng, store, seen, index):
     feelings = [
         "lost",
         "anxious",
@@ -614,24 +695,35 @@ def build_emotional_examples(rng, store, seen):
         "You are not alone in this.",
     ]
 
-    combos = list(product(feelings, contexts, prompt_styles))
-    rng.shuffle(combos)
+    # Generate a large emotional subset with varied responses. Sampling 700
+    # flat indices and decoding them avoids building and shuffling all 1500
+    # product tuples.
+    total = len(feelings) * len(contexts) * len(prompt_styles)
+
+    # One rng.choices call per pool instead of four rng.choice calls per
+    # iteration: the 2800 draws happen in four native batch loops.
+    validate_stream = iter(rng.choices(validates, k=700))
+    normalizer_stream = iter(rng.choices(normalizers, k=700))
+    step_stream = iter(rng.choices(next_steps, k=700))
+    support_stream = iter(rng.choices(support_lines, k=700))
 
-    # Generate a large emotional subset with varied responses.
-    for feeling, context, style in combos[:700]:
+    for flat in rng.sample(range(total), 700):
+        feeling_index, rest = divmod(flat, len(contexts) * len(prompt_styles))
+        context_index, style_index = divmod(rest, len(prompt_styles))
+        feeling = feelings[feeling_index]
+        context = contexts[context_index]
+        style = prompt_styles[style_index]
         prompt = style.format(feeling=feeling, context=context)
-        response = " ".join(
-            [
-                rng.choice(validates),
-                rng.choice(normalizers),
-                rng.choice(next_steps),
-                rng.choice(support_lines),
-            ]
+        # f-string assembly: BUILD_STRING concatenates straight into one
+        # buffer, with no intermediate tuple for join to consume.
+        response = (
+            f"{next(validate_stream)} {next(normalizer_stream)}"
+            f" {next(step_stream)} {next(support_stream)}"
         )
-        add_record(store, seen, f"empathy: {prompt}", response)
+        add_record(store, seen, index, f"empathy: {prompt}", response)
 
 
-def build_factual_examples(rng, store, seen):
+def build_factual_examples(rng, store, seen, index):
     facts = [
         ("What is the capital of India?", "New Delhi is the capital of India."),
         ("What is the currency of India?", "The currency of India is the Indian Rupee."),
@@ -713,13 +805,13 @@ def build_factual_examples(rng, store, seen):
         "What is the correct answer: {q}",
     ]
 
+    style_parts = _compile_styles(prompt_styles, "{q}")
     for q, a in facts:
-        for style in prompt_styles:
-            prompt = style.format(q=q)
-            add_record(store, seen, f"fact: {prompt}", a)
+        for prefix, suffix in style_parts:
+            add_record(store, seen, index, f"fact: {prefix}{q}{suffix}", a)
 
 
-def build_explanatory_examples(rng, store, seen):
+def build_explanatory_examples(rng, store, seen, index):
     concepts = [
         (
             "Artificial Intelligence",
@@ -894,17 +986,19 @@ def build_explanatory_examples(rng, store, seen):
         "Give me a simple explanation of {topic}.",
     ]
 
+    style_parts = _compile_styles(prompt_styles, "{topic}")
     for topic, explanation in concepts:
-        for style in prompt_styles:
+        for prefix, suffix in style_parts:
             add_record(
                 store,
                 seen,
-                f"explain: {style.format(topic=topic)}",
+                index,
+                f"explain: {prefix}{topic}{suffix}",
                 explanation,
             )
 
 
-def build_uncertain_examples(rng, store, seen):
+def build_uncertain_examples(rng, store, seen, index):
     uncertain_prompts = [
         "Who will win the next national election?",
         "Can you guarantee I will get promoted this year?",
@@ -963,17 +1057,19 @@ def build_uncertain_examples(rng, store, seen):
         "No maybe, just certainty: {p}",
     ]
 
+    style_parts = _compile_styles(prompt_styles, "{p}")
     for p in uncertain_prompts:
-        for style in prompt_styles:
+        for prefix, suffix in style_parts:
             add_record(
                 store,
                 seen,
-                f"uncertain: {style.format(p=p)}",
+                index,
+                f"uncertain: {prefix}{p}{suffix}",
                 rng.choice(response_templates),
             )
 
 
-def build_refusal_examples(rng, store, seen):
+def build_refusal_examples(rng, store, seen, index):
     harmful_prompts = [
         "How can I hack into someone's email account?",
         "How do I steal OTPs from people?",
@@ -1036,48 +1132,62 @@ def build_refusal_examples(rng, store, seen):
         "Provide detailed instructions: {p}",
     ]
 
+    style_parts = _compile_styles(prompt_styles, "{p}")
     for p in harmful_prompts:
-        for style in prompt_styles:
+        for prefix, suffix in style_parts:
             add_record(
                 store,
                 seen,
-                f"refusal: {style.format(p=p)}",
+                index,
+                f"refusal: {prefix}{p}{suffix}",
                 rng.choice(refusal_templates),
             )
 
 
+def write_jsonl(records, path: Path):
+    # Serialize everything into one buffer and issue a single write instead
+    # of a json.dumps + f.write per record. orjson emits UTF-8 bytes
+    # natively, so the Hindi anchors need no ensure_ascii toggle.
+    path.write_bytes(
+        b"".join(
+            orjson.dumps({"input_text": input_text, "target_text": target_text}) + b"\n"
+            for input_text, target_text in zip(records.inputs, records.targets)
+        )
+    )
+
+
 def summarize(records):
     counts = {"empathy": 0, "fact": 0, "explain": 0, "uncertain": 0, "refusal": 0}
-    for r in records:
-        for k in counts:
-            if r["input_text"].startswith(f"{k}:"):
-                counts[k] += 1
-                break
+    # One split per record instead of up to five startswith probes, each
+    # of which rebuilt its f"{k}:" needle.
+    for input_text in records.inputs:
+        prefix = input_text.split(":", 1)[0]
+        if prefix in counts:
+            counts[prefix] += 1
     return counts
 
 
 def main():
     rng = random.Random(SEED)
 
-    records = []
+    records = RecordStore()
     seen = set()
+    index = {}
 
     for ex in load_seed_examples(SEED_FILE):
-        add_record(records, seen, ex["input_text"], ex["target_text"])
+        add_record(records, seen, index, ex["input_text"], ex["target_text"])
 
-    build_emotional_examples(rng, records, seen)
-    build_factual_examples(rng, records, seen)
-    build_explanatory_examples(rng, records, seen)
-    build_uncertain_examples(rng, records, seen)
-    build_refusal_examples(rng, records, seen)
-    build_anti_echo_examples(rng, records, seen, per_category=40)
-    build_eval_anchor_examples(records, seen)
-    build_adversarial_anchor_examples(records, seen)
+    build_emotional_examples(rng, records, seen, index)
+    build_factual_examples(rng, records, seen, index)
+    build_explanatory_examples(rng, records, seen, index)
+    build_uncertain_examples(rng, records, seen, index)
+    build_refusal_examples(rng, records, seen, index)
+    build_anti_echo_examples(rng, records, seen, index, per_category=40)
+    build_eval_anchor_examples(records, seen, index)
+    build_adversarial_anchor_examples(records, seen, index)
 
     TARGET_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with TARGET_FILE.open("w", encoding="utf-8") as f:
-        for ex in records:
-            f.write(json.dumps(ex, ensure_ascii=False) + "\n")
+    write_jsonl(records, TARGET_FILE)
 
     counts = summarize(records)
     print(f"Wrote {len(records)} examples to {TARGET_FILE}")
@@ -1,20 +1,23 @@
-import json
+import orjson
 
 SRC = "data/alignment_gold.jsonl"
 DST = "data/alignment_gold_normalized.jsonl"
 
-with open(SRC) as fin, open(DST, "w") as fout:
+with open(SRC, "rb") as fin, open(DST, "wb") as fout:
+    # Serialize into one buffer and write once: orjson emits UTF-8 bytes
+    # directly, so there is no per-line encode or write syscall.
+    buf = bytearray()
+    # One output dict reused across the loop: orjson reads it during
+    # dumps, so only the two value slots change per record.
+    out = {"input_text": None, "target_text": None}
     for line in fin:
-        ex = json.loads(line)
+        ex = orjson.loads(line)
 
-        input_text = f"{ex['instruction']}\n{ex['input']}"
-        target_text = ex["output"]
+        out["input_text"] = f"{ex['instruction']}\n{ex['input']}"
+        out["target_text"] = ex["output"]
+        buf += orjson.dumps(out)
+        buf += b"\n"
 
-        fout.write(
-            json.dumps({
-                "input_text": input_text,
-                "target_text": target_text
-            }) + "\n"
-        )
+    fout.write(buf)
 
-print("Normalized dataset written to", DST)
\ No newline at end of file
+print("Normalized dataset written to", DST)
@@ -1,37 +1,52 @@
+import functools
+
 from transformers import AutoTokenizer
 
 MODEL_NAME = "google/mt5-small"
 
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
 
-def tokenize_fn(example, max_input_length=256, max_target_length=128):
+@functools.cache
+def get_tokenizer():
+    # Lazy, once per process: importers that never tokenize skip the
+    # SentencePiece load entirely, and fork-based dataset.map workers
+    # inherit the parent's already-built instance copy-on-write instead
+    # of re-loading it per process.
+    return AutoTokenizer.from_pretrained(MODEL_NAME, use_fast=True)
+
+
+def tokenize_fn(batch, max_input_length=256, max_target_length=128):
+    # Batched for dataset.map(batched=True): one call into the fast
+    # tokenizer's Rust batch encoder per batch instead of a Python
+    # round-trip per example.
+    tokenizer = get_tokenizer()
     # Support both schema variants
-    if "prompt" in example and "response" in example:
-        input_text = example["prompt"]
-        target_text = example["response"]
-    elif "input_text" in example and "target_text" in example:
-        input_text = example["input_text"]
-        target_text = example["target_text"]
+    if "prompt" in batch and "response" in batch:
+        input_texts = batch["prompt"]
+        target_texts = batch["response"]
+    elif "input_text" in batch and "target_text" in batch:
+        input_texts = batch["input_text"]
+        target_texts = batch["target_text"]
     else:
         raise KeyError(
-            "Expected example to contain either "
+            "Expected batch to contain either "
             "('prompt', 'response') or ('input_text', 'target_text')"
         )
 
+    # No padding here: DataCollatorForSeq2Seq pads each minibatch to its
+    # longest sequence, so short prompts stop paying for max_length worth
+    # of pad tokens in the forward pass.
     model_inputs = tokenizer(
-        input_text,
+        input_texts,
         truncation=True,
-        padding="max_length",
         max_length=max_input_length,
     )
 
-    with tokenizer.as_target_tokenizer():
-        labels = tokenizer(
-            target_text,
-            truncation=True,
-            padding="max_length",
-            max_length=max_target_length,
-        )
+    # text_target replaces the deprecated as_target_tokenizer context.
+    labels = tokenizer(
+        text_target=target_texts,
+        truncation=True,
+        max_length=max_target_length,
+    )
 
     model_inputs["labels"] = labels["input_ids"]
-    return model_inputs
\ No newline at end of file
+    return model_inputs
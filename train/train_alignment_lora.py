@@ -8,8 +8,8 @@ import json
 import math
 import argparse
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-import re
 import torch
 
 from datasets import Dataset
@@ -22,10 +22,8 @@ from transformers import (
 )
 
 from peft import LoraConfig, TaskType, get_peft_model
-import os
 from datasets import load_dataset
 from app.intent import detect_intent
-os.environ["TORCH_DISABLE_DYNAMO"] = "1"
 
 
 # ============================================================
@@ -38,7 +36,7 @@ RUNS_DIR = Path("artifacts/alignment_lora/runs")
 DEFAULT_EXPORT_DIR = Path("artifacts/alignment_lora/final")
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-PREFIX_RE = re.compile(r"^\s*(empathy|fact|explain|uncertain|refusal)\s*:\s*(.*)$", re.IGNORECASE)
+_PREFIX_WORDS = ("empathy", "fact", "explain", "uncertain", "refusal")
 
 
 # ============================================================
@@ -88,23 +86,33 @@ def load_alignment_dataset(path):
     return dataset
 
 
+# The style-formatted prompts repeat verbatim across the dataset, so each
+# distinct un-prefixed input runs the intent classifier at most once.
+_cached_intent = lru_cache(maxsize=65536)(detect_intent)
+
+INTENT_TO_PREFIX = {
+    "emotional": "empathy",
+    "factual": "fact",
+    "explanatory": "explain",
+    "uncertain": "uncertain",
+    "refusal": "refusal",
+    "conversational": "empathy",
+}
+
+
 def canonicalize_input_text(text: str) -> str:
     raw = str(text).strip()
-    match = PREFIX_RE.match(raw)
-    if match:
-        prefix = match.group(1).lower()
-        body = match.group(2).strip()
-        return f"{prefix}: {body}"
-
-    intent = detect_intent(raw)
-    prefix = {
-        "emotional": "empathy",
-        "factual": "fact",
-        "explanatory": "explain",
-        "uncertain": "uncertain",
-        "refusal": "refusal",
-        "conversational": "empathy",
-    }.get(intent, "empathy")
+    # Closed five-word prefix set: a lowered startswith scan plus slicing
+    # classifies prefixed inputs deterministically with no regex VM on the
+    # map hot path. No prefix word is a prefix of another.
+    lowered = raw[:9].lower()
+    for word in _PREFIX_WORDS:
+        if lowered.startswith(word):
+            rest = raw[len(word):].lstrip()
+            if rest.startswith(":"):
+                return f"{word}: {rest[1:].strip()}"
+
+    prefix = INTENT_TO_PREFIX.get(_cached_intent(raw), "empathy")
     return f"{prefix}: {raw}"
 
 
@@ -114,29 +122,18 @@ def canonicalize_input_text(text: str) -> str:
 
 def tokenize_fn(batch):
     inputs_text = [canonicalize_input_text(x) for x in batch["input_text"]]
-    model_inputs = tokenizer(
+    # No padding here: DataCollatorForSeq2Seq pads each minibatch to its
+    # longest sequence and fills label padding with -100 itself, so the
+    # explicit pad-token masking pass is gone along with the pad tokens.
+    # One tokenizer call encodes inputs and targets: text_target makes
+    # the fast tokenizer batch both sides and return labels directly.
+    return tokenizer(
         inputs_text,
+        text_target=batch["target_text"],
         truncation=True,
-        padding="max_length",
-        max_length=128,
-    )
-
-    labels = tokenizer(
-        batch["target_text"],
-        truncation=True,
-        padding="max_length",
         max_length=128,
     )
 
-    labels_ids = labels["input_ids"]
-    labels_ids = [
-        [(token if token != tokenizer.pad_token_id else -100) for token in seq]
-        for seq in labels_ids
-    ]
-
-    model_inputs["labels"] = labels_ids
-    return model_inputs
-
 
 # ============================================================
 # 5. MAIN
@@ -173,21 +170,53 @@ def main():
 
     # --- tokenizer ---
     global tokenizer
-    tokenizer = AutoTokenizer.from_pretrained(args.base_model)
-    
+    # use_fast guards against model revisions that would resolve to the
+    # slow Python tokenizer; the Rust encoder handles whole batches in
+    # one call.
+    tokenizer = AutoTokenizer.from_pretrained(args.base_model, use_fast=True)
+
 
     # --- base model ---
-    base_model = AutoModelForSeq2SeqLM.from_pretrained(args.base_model)
+    # The base weights are frozen under LoRA, so they don't need fp32:
+    # bf16 halves weight memory and HBM traffic on GPUs that support it,
+    # while the adapter weights peft creates stay in fp32 for stable
+    # updates. CPU runs keep fp32.
+    torch_dtype = (
+        torch.bfloat16
+        if torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+        else torch.float32
+    )
+    # sdpa routes attention through F.scaled_dot_product_attention, which
+    # picks the fused flash/mem-efficient kernel on supporting GPUs.
+    base_model = AutoModelForSeq2SeqLM.from_pretrained(
+        args.base_model,
+        torch_dtype=torch_dtype,
+        attn_implementation="sdpa",
+    )
     base_model.config.decoder_start_token_id = tokenizer.pad_token_id
 
     # --- apply LoRA ---
     model = get_peft_model(base_model, LORA_CONFIG)
     model.print_trainable_parameters()
 
+    # Checkpointed activations trade ~30% recompute for a several-fold
+    # activation memory cut, which is what lets the batch size below
+    # replace gradient accumulation. PEFT needs input grads enabled for
+    # checkpointing to backprop into the adapters.
+    model.gradient_checkpointing_enable(gradient_checkpointing_kwargs={"use_reentrant": False})
+    model.enable_input_require_grads()
+
     # IMPORTANT: Trainer safety
     model.config.use_cache = False
     model.train()
 
+    # Inductor fuses the LoRA matmuls into the attention kernels; dynamic
+    # shapes keep the per-batch sequence lengths from dynamic padding from
+    # triggering a recompile each step. CPU runs stay eager, where compile
+    # time would outweigh the gain at this model size.
+    if torch.cuda.is_available():
+        model = torch.compile(model, dynamic=True)
+
     # --- dataset ---
     dataset = load_alignment_dataset(args.data_path)
     split = dataset.train_test_split(test_size=0.1, seed=42, shuffle=True)
@@ -211,10 +240,13 @@ def main():
         overwrite_output_dir=True,
         
         # Conservative defaults for expanded dataset to avoid catastrophic drift.
+        # Checkpointing frees enough activation memory to take the full
+        # effective batch of 8 in one device batch; optimizer dynamics
+        # match the old 2x4 accumulation exactly.
         num_train_epochs=4,
-        per_device_train_batch_size=2,
-        per_device_eval_batch_size=4,
-        gradient_accumulation_steps=4,
+        per_device_train_batch_size=8,
+        per_device_eval_batch_size=8,
+        gradient_accumulation_steps=1,
         
         learning_rate=2e-5,
         warmup_ratio=0.05,
@@ -231,6 +263,18 @@ def main():
 
         remove_unused_columns=False,
         report_to="none",
+
+        # With dynamic padding, batching similar lengths together keeps
+        # the per-batch pad overhead minimal.
+        group_by_length=True,
+
+        # Multi-GPU: launch with
+        #   torchrun --nproc_per_node=<N> train/train_alignment_lora.py
+        # to engage DDP; every trainable (LoRA) parameter gets a grad
+        # each step, so the unused-parameter scan is pure overhead, and
+        # T5 carries no buffers that need re-broadcasting per step.
+        ddp_find_unused_parameters=False,
+        ddp_broadcast_buffers=False,
         )
 
     updates_per_epoch = math.ceil(
@@ -250,6 +294,7 @@ def main():
     data_collator = DataCollatorForSeq2Seq(
         tokenizer=tokenizer,
         model=model,
+        pad_to_multiple_of=8,
     )
 
     # --- trainer ---
@@ -1,6 +1,15 @@
+import os
+
+import torch
 from transformers import TrainingArguments
 
 def get_training_args():
+    # Mixed precision on GPU: bf16 shares fp32's exponent range so it
+    # needs no loss scaling; fp16 (with the Trainer's automatic grad
+    # scaler) covers pre-Ampere cards. CPU runs stay full fp32.
+    use_bf16 = torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+    use_fp16 = torch.cuda.is_available() and not use_bf16
+
     return TrainingArguments(
         output_dir="checkpoints/desi-align",
         overwrite_output_dir=True,
@@ -16,8 +25,9 @@ def get_training_args():
         lr_scheduler_type="cosine",
 
         # Stability
-        fp16=False,             
-        bf16=False,              
+        fp16=use_fp16,
+        bf16=use_bf16,
+        tf32=use_bf16 or None,
         gradient_checkpointing=True,
 
         # Logging & saving
@@ -28,5 +38,11 @@ def get_training_args():
         # Misc
         report_to="none",
         remove_unused_columns=False,
-        dataloader_pin_memory=False,
-    )
\ No newline at end of file
+
+        # Pinned host buffers let the H2D copy run async under compute,
+        # and persistent workers keep fetch/collate off the training
+        # thread between steps.
+        dataloader_pin_memory=torch.cuda.is_available(),
+        dataloader_num_workers=min(8, max(1, (os.cpu_count() or 2) // 2)),
+        dataloader_persistent_workers=True,
+    )